@@ -1,3 +1,4 @@
+import orjson
 from fastapi import APIRouter, Request
 from app.webhook import handle_webhook
 
@@ -5,5 +6,5 @@ router = APIRouter()
 
 @router.post("/webhook")
 async def webhook(request: Request):
-    payload = await request.json()
+    payload = orjson.loads(await request.body())
     return handle_webhook(payload)
@@ -1,10 +1,137 @@
-import requests
+import asyncio
+import logging
+import httpx
+import orjson
 from app.config import TELEGRAM_TOKEN, TELEGRAM_CHAT_ID
 
-def send_message(text: str):
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": text
-    }
-    requests.post(url, json=payload)
+log = logging.getLogger(__name__)
+
+TG_URL = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage" if TELEGRAM_TOKEN else None
+_TG_BASE = {"chat_id": TELEGRAM_CHAT_ID}
+_TG_HEADERS = {"Content-Type": "application/json"}
+TG_MAX_LEN = 4096
+TG_MAX_RETRIES = 3
+
+# Messages queued within one window are sent as a single sendMessage call.
+BATCH_WINDOW = 0.1
+BATCH_MAX = 20
+BATCH_SEPARATOR = "\n\n———\n\n"
+OUTBOX_MAX = 1000
+SHUTDOWN_FLUSH_TIMEOUT = 10
+
+_STOP = object()
+_outbox = None
+_worker = None
+_client = None
+
+async def send_message(text: str):
+    if TG_URL is None:
+        return
+    body = orjson.dumps({**_TG_BASE, "text": text})
+    for attempt in range(TG_MAX_RETRIES):
+        r = await _client.post(TG_URL, content=body, headers=_TG_HEADERS)
+        if r.status_code != 429 or attempt == TG_MAX_RETRIES - 1:
+            break
+        retry_after = r.json().get("parameters", {}).get("retry_after", 1)
+        log.warning("Telegram rate limit hit, retrying in %ss", retry_after)
+        await asyncio.sleep(retry_after)
+    r.raise_for_status()
+
+def queue_message(text: str):
+    if _outbox is None:
+        log.warning("Telegram outbox not running, dropped message")
+        return
+    try:
+        _outbox.put_nowait(text)
+    except asyncio.QueueFull:
+        log.warning("Telegram outbox full (%d), dropped message", OUTBOX_MAX)
+
+def _drain(q: asyncio.Queue, batch: list) -> bool:
+    """Top up `batch` from the queue; returns True once the stop sentinel is seen."""
+    while len(batch) < BATCH_MAX and not q.empty():
+        item = q.get_nowait()
+        if item is _STOP:
+            return True
+        batch.append(item)
+    return False
+
+def _split(batch: list):
+    """Group messages so that each joined chunk fits in one Telegram message."""
+    chunk, size = [], 0
+    for text in batch:
+        extra = len(text) + (len(BATCH_SEPARATOR) if chunk else 0)
+        if chunk and size + extra > TG_MAX_LEN:
+            yield chunk
+            chunk, size = [], 0
+            extra = len(text)
+        chunk.append(text)
+        size += extra
+    if chunk:
+        yield chunk
+
+async def _send_one(text: str):
+    try:
+        await send_message(text)
+    except Exception:
+        log.exception("Telegram send failed, dropped 1 message")
+
+async def _send_batch(batch: list):
+    for chunk in _split(batch):
+        if len(chunk) == 1:
+            await _send_one(chunk[0])
+            continue
+        try:
+            await send_message(BATCH_SEPARATOR.join(chunk))
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 400:
+                log.exception("Telegram send failed, dropped %d message(s)", len(chunk))
+                continue
+            # Rejected outright, so nothing was delivered: isolate the bad message.
+            log.warning("Telegram rejected batch, retrying %d message(s) one by one", len(chunk))
+            for text in chunk:
+                await _send_one(text)
+        except Exception:
+            # Timeouts and transport errors may still have delivered the batch;
+            # resending would duplicate signals.
+            log.exception("Telegram send failed, dropped %d message(s)", len(chunk))
+
+async def _outbox_loop(q: asyncio.Queue):
+    while True:
+        item = await q.get()
+        if item is _STOP:
+            return
+        batch = [item]
+        await asyncio.sleep(BATCH_WINDOW)
+        stop = _drain(q, batch)
+        await _send_batch(batch)
+        if stop:
+            return
+
+def start_outbox():
+    global _outbox, _worker, _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=15)
+    if _worker is None:
+        _outbox = asyncio.Queue(maxsize=OUTBOX_MAX)
+        _worker = asyncio.create_task(_outbox_loop(_outbox))
+
+async def _flush(q: asyncio.Queue, worker: asyncio.Task):
+    await q.put(_STOP)
+    await worker
+
+async def stop_outbox():
+    """Send what is still queued, within SHUTDOWN_FLUSH_TIMEOUT, then close the client."""
+    global _outbox, _worker, _client
+    if _worker is not None:
+        q, worker = _outbox, _worker
+        _outbox = _worker = None
+        try:
+            await asyncio.wait_for(_flush(q, worker), SHUTDOWN_FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+            left = sum(q.get_nowait() is not _STOP for _ in range(q.qsize()))
+            log.warning("Telegram outbox flush timed out, dropped %d queued message(s)", left)
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,16 +1,28 @@
-from datetime import datetime
+import time
 
-def now():
-    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+SIGNAL_TEMPLATE = """🟡 GOLD SCALPING SIGNAL
 
-def format_signal(data):
-    return f"""
-🟡 GOLD SCALPING SIGNAL
+📊 Symbol: {symbol}
+⏱ Timeframe: {timeframe}
+📈 Direction: {direction}
+💰 Price: {price}
+
+🕒 Time (UTC): {time}"""
 
-📊 Symbol: {data['symbol']}
-⏱ Timeframe: {data['timeframe']}
-📈 Direction: {data['direction']}
-💰 Price: {data['price']}
+_now_cache = (-1, "")
 
-🕒 Time (UTC): {now()}
-    """.strip()
+def now():
+    global _now_cache
+    sec = int(time.time())
+    if _now_cache[0] != sec:
+        _now_cache = (sec, time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(sec)))
+    return _now_cache[1]
+
+def format_signal(data):
+    return SIGNAL_TEMPLATE.format(
+        symbol=data['symbol'],
+        timeframe=data['timeframe'],
+        direction=data['direction'],
+        price=data['price'],
+        time=now(),
+    )
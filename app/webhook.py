@@ -1,18 +1,22 @@
+from hmac import compare_digest
 from fastapi import HTTPException
 from app.config import TV_WEBHOOK_SECRET
-from app.telegram import send_message
+from app.telegram import queue_message
 from app.utils import format_signal
 
+_SECRET = (TV_WEBHOOK_SECRET or "").encode()
+REQUIRED_FIELDS = ("symbol", "timeframe", "direction", "price")
+
 def handle_webhook(payload: dict):
-    if payload.get("secret") != TV_WEBHOOK_SECRET:
+    secret = str(payload.get("secret") or "")
+    if not compare_digest(secret.encode(), _SECRET):
         raise HTTPException(status_code=403, detail="Invalid secret")
 
-    required = ["symbol", "timeframe", "direction", "price"]
-    for r in required:
+    for r in REQUIRED_FIELDS:
         if r not in payload:
             raise HTTPException(status_code=400, detail=f"Missing {r}")
 
     message = format_signal(payload)
-    send_message(message)
+    queue_message(message)
 
     return {"status": "ok"}
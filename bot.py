@@ -1,6 +1,16 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.server import router
+from app.telegram import start_outbox, stop_outbox
 
-app = FastAPI(title="Gold Scalping Bot")
+app = FastAPI(title="Gold Scalping Bot", default_response_class=ORJSONResponse)
 
 app.include_router(router)
+
+@app.on_event("startup")
+async def startup():
+    start_outbox()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_outbox()
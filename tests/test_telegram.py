@@ -0,0 +1,141 @@
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from app import telegram
+
+
+class FakeClient:
+    """Stands in for httpx.AsyncClient; `responses` yields status codes or (status, json) pairs."""
+
+    def __init__(self, responses=()):
+        self.sent = []
+        self.responses = list(responses)
+        self.closed = False
+        self.hang = False
+
+    async def post(self, url, content, headers):
+        text = orjson.loads(content)["text"]
+        self.sent.append(text)
+        if self.hang:
+            await asyncio.Event().wait()
+        status, body = 200, {"ok": True}
+        if self.responses:
+            status = self.responses.pop(0)
+            if isinstance(status, Exception):
+                raise status
+            if isinstance(status, tuple):
+                status, body = status
+        elif len(text) > telegram.TG_MAX_LEN:
+            status, body = 400, {"ok": False}
+        return httpx.Response(status, json=body, request=httpx.Request("POST", url))
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeClient()
+    monkeypatch.setattr(telegram, "TG_URL", "https://telegram.test/sendMessage")
+    monkeypatch.setattr(telegram, "_client", fake)
+    return fake
+
+
+def run_outbox(messages, delay=None):
+    async def go():
+        telegram.start_outbox()
+        for m in messages:
+            telegram.queue_message(m)
+        if delay is not None:
+            await asyncio.sleep(delay)
+        await telegram.stop_outbox()
+    asyncio.run(go())
+
+
+def test_burst_is_coalesced_into_one_send(client):
+    run_outbox(["m0", "m1", "m2"], delay=telegram.BATCH_WINDOW * 3)
+    assert client.sent == [telegram.BATCH_SEPARATOR.join(["m0", "m1", "m2"])]
+
+
+def test_batch_is_capped(client):
+    messages = [f"m{i}" for i in range(telegram.BATCH_MAX + 5)]
+    run_outbox(messages, delay=telegram.BATCH_WINDOW * 3)
+    assert [s.split(telegram.BATCH_SEPARATOR) for s in client.sent] == [
+        messages[:telegram.BATCH_MAX],
+        messages[telegram.BATCH_MAX:],
+    ]
+
+
+def test_shutdown_during_window_flushes_everything(client):
+    run_outbox(["m0", "m1", "m2"], delay=0)
+    assert client.sent == [telegram.BATCH_SEPARATOR.join(["m0", "m1", "m2"])]
+    assert client.closed
+    assert telegram._client is None
+
+
+def test_oversized_message_does_not_take_down_the_batch(client, caplog):
+    big = "x" * 5000
+    run_outbox(["good1", big, "good2"])
+    assert client.sent == ["good1", big, "good2"]
+    assert "dropped 1 message" in caplog.text
+
+
+def test_rejected_batch_is_retried_one_by_one(client):
+    client.responses = [400]
+    run_outbox(["m0", "m1"])
+    assert client.sent == [telegram.BATCH_SEPARATOR.join(["m0", "m1"]), "m0", "m1"]
+
+
+@pytest.mark.parametrize("failure", [500, httpx.ReadTimeout("timed out")])
+def test_possibly_delivered_batch_is_not_resent(client, caplog, failure):
+    client.responses = [failure]
+    run_outbox(["m0", "m1"])
+    assert client.sent == [telegram.BATCH_SEPARATOR.join(["m0", "m1"])]
+    assert "dropped 2 message(s)" in caplog.text
+
+
+def test_rate_limit_waits_and_retries(client):
+    client.responses = [(429, {"ok": False, "parameters": {"retry_after": 0}})]
+    run_outbox(["m0"])
+    assert client.sent == ["m0", "m0"]
+
+
+def test_outbox_restarts_on_a_new_event_loop(client):
+    async def go(text):
+        telegram.start_outbox()
+        await asyncio.sleep(0)  # let the worker block on an empty queue first
+        telegram.queue_message(text)
+        await asyncio.sleep(telegram.BATCH_WINDOW * 3)
+        sent_before_stop = list(client.sent)
+        await telegram.stop_outbox()
+        return sent_before_stop
+
+    assert asyncio.run(go("first")) == ["first"]
+    telegram._client = client
+    assert asyncio.run(go("second")) == ["first", "second"]
+
+
+def test_queue_message_without_outbox_is_dropped(client, caplog):
+    telegram.queue_message("m0")
+    assert client.sent == []
+    assert "not running" in caplog.text
+
+
+def test_full_outbox_drops_and_logs(client, monkeypatch, caplog):
+    monkeypatch.setattr(telegram, "OUTBOX_MAX", 2)
+    run_outbox(["m0", "m1", "m2"])
+    assert client.sent == [telegram.BATCH_SEPARATOR.join(["m0", "m1"])]
+    assert "outbox full" in caplog.text
+
+
+def test_shutdown_flush_is_bounded(client, monkeypatch, caplog):
+    monkeypatch.setattr(telegram, "SHUTDOWN_FLUSH_TIMEOUT", 0.2)
+    monkeypatch.setattr(telegram, "BATCH_MAX", 1)
+    client.hang = True
+    run_outbox(["m0", "m1", "m2"])
+    assert client.sent == ["m0"]
+    assert client.closed
+    assert "dropped 2 queued message(s)" in caplog.text